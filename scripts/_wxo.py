@@ -0,0 +1,238 @@
+"""Helpers shared by the import/export scripts for driving the orchestrate CLI."""
+
+import argparse
+import asyncio
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+from collections.abc import Coroutine, Sequence
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+logger = logging.getLogger(__name__)
+
+# Resolved once so each spawned CLI call skips the PATH lookup.
+ORCHESTRATE_BIN = shutil.which("orchestrate") or "orchestrate"
+
+# Banner line framing the start and summary of each script's log output.
+SEPARATOR = "=" * 60
+
+# The ADK rejects tokens this close to their expiry (check_token_validity), so the
+# cached activation is dropped at the same point.
+TOKEN_EXPIRY_MARGIN = 600
+
+_CACHE_FILE = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "wxo_git_template" / "active_env.json"
+# Written by the ADK on activation; used to detect an environment switched outside these scripts.
+_ORCHESTRATE_CONFIG = Path.home() / ".config" / "orchestrate" / "config.yaml"
+# Written by the ADK on activation; holds each environment's token and its expiry.
+_ORCHESTRATE_CREDENTIALS = Path.home() / ".cache" / "orchestrate" / "credentials.yaml"
+
+# time.monotonic() value after which run() refuses to wait any longer; None means unbounded.
+_deadline: float | None = None
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when the budget given to ``set_deadline`` is spent; retrying is pointless."""
+
+
+def set_deadline(seconds: float) -> None:
+    """Cap the total wall time of all later ``run`` calls to ``seconds`` from now."""
+    global _deadline
+    _deadline = time.monotonic() + seconds
+
+
+def positive_int(value: str) -> int:
+    """Argparse ``type`` for counts that must be at least 1, such as ``--concurrency``."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}") from None
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {number}")
+    return number
+
+
+def build_parser(description: str, **kwargs: Any) -> argparse.ArgumentParser:
+    """Return an argument parser that already has the flags every script accepts."""
+    parser = argparse.ArgumentParser(description=description, **kwargs)
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Enable verbose debug logging",
+    )
+    parser.add_argument(
+        "--env",
+        type=str,
+        default=None,
+        help="Name of the WXO environment to activate before import",
+    )
+    parser.add_argument(
+        "--api-key",
+        type=str,
+        default=None,
+        help="API key for non-interactive environment activation (falls back to WXO_API_KEY env var)",
+    )
+    return parser
+
+
+def configure_logging(verbose: bool) -> None:
+    """Send script logs to stderr, at DEBUG level when ``verbose`` is set."""
+    logging.basicConfig(
+        level=logging.DEBUG if verbose else logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+
+
+async def run(cmd: Sequence[str], timeout: float) -> tuple[int, bytes, bytes]:
+    """Run a command on the event loop and return (return code, stdout, stderr).
+
+    Output is returned as raw bytes; callers decode it only when they need to log it.
+
+    Args:
+        cmd: Command and arguments to execute.
+        timeout: Seconds to wait for the command to finish, shortened to whatever is
+            left of the budget given to ``set_deadline``.
+
+    Raises:
+        DeadlineExceeded: If the deadline has already passed (the command is not
+            started), or is reached while the command runs (the process is killed).
+        TimeoutError: If the command does not finish within ``timeout`` (the process is killed).
+
+    The process is also killed if the awaiting task is cancelled.
+    """
+    deadline_bound = False
+    if _deadline is not None:
+        remaining = _deadline - time.monotonic()
+        if remaining <= 0:
+            raise DeadlineExceeded("deadline exceeded")
+        if remaining < timeout:
+            timeout, deadline_bound = remaining, True
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        # Lets subprocess use posix_spawn instead of fork+exec; safe because Python
+        # creates descriptors non-inheritable by default (PEP 446).
+        close_fds=False,
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout)
+    except BaseException as e:
+        # Also reached on cancellation (Ctrl+C): never leave the child running.
+        if proc.returncode is None:
+            with contextlib.suppress(ProcessLookupError):
+                proc.kill()
+            await asyncio.shield(proc.wait())
+        if deadline_bound and isinstance(e, TimeoutError):
+            raise DeadlineExceeded("deadline exceeded") from None
+        raise
+    return proc.returncode, stdout, stderr
+
+
+async def sleep_before_retry(delay: float) -> None:
+    """Wait ``delay`` seconds before a retry.
+
+    Raises:
+        DeadlineExceeded: Immediately, without sleeping, if the wait would end past the deadline.
+    """
+    if _deadline is not None and time.monotonic() + delay >= _deadline:
+        raise DeadlineExceeded("deadline exceeded")
+    await asyncio.sleep(delay)
+
+
+def run_main(main: Coroutine[Any, Any, int]) -> int:
+    """Run a script's main coroutine to completion, on uvloop when it is installed."""
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.run(main)
+    return asyncio.run(main, loop_factory=uvloop.new_event_loop)
+
+
+def _activation_key(env_name: str, api_key: str | None) -> str:
+    return hashlib.sha256(f"{env_name}\0{api_key or ''}".encode()).hexdigest()
+
+
+def _active_environment() -> str | None:
+    """Return the environment the orchestrate CLI currently considers active, if known."""
+    try:
+        with open(_ORCHESTRATE_CONFIG, encoding="utf-8") as f:
+            config = yaml.safe_load(f) or {}
+        return (config.get("context") or {}).get("active_environment")
+    except (OSError, yaml.YAMLError, AttributeError):
+        return None
+
+
+def _token_expiry(env_name: str) -> float | None:
+    """Return the expiry (epoch seconds) of the ADK token stored for ``env_name``, if known."""
+    try:
+        with open(_ORCHESTRATE_CREDENTIALS, encoding="utf-8") as f:
+            credentials = yaml.safe_load(f) or {}
+        expiry = ((credentials.get("auth") or {}).get(env_name) or {}).get("wxo_mcsp_token_expiry")
+    except (OSError, yaml.YAMLError, AttributeError):
+        return None
+    return expiry if isinstance(expiry, int | float) else None
+
+
+def _is_cached(key: str, env_name: str) -> bool:
+    try:
+        entry = json.loads(_CACHE_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return False
+    if entry.get("key") != key or _active_environment() != env_name:
+        return False
+    expiry = _token_expiry(env_name)
+    return expiry is not None and time.time() < expiry - TOKEN_EXPIRY_MARGIN
+
+
+async def ensure_environment(env_name: str, api_key: str | None = None) -> None:
+    """Activate a WXO environment, skipping the CLI call if it was recently activated.
+
+    The activation is cached, keyed on a hash of the environment name and API key,
+    and only reused while the orchestrate CLI still reports ``env_name`` as its
+    active environment and the token it stored is more than
+    ``TOKEN_EXPIRY_MARGIN`` seconds from expiring.
+    """
+    key = _activation_key(env_name, api_key)
+    if _is_cached(key, env_name):
+        logger.info("Environment already active: %s", env_name)
+        return
+
+    cmd = [ORCHESTRATE_BIN, "env", "activate", env_name]
+    if api_key:
+        cmd.extend(["--api-key", api_key])
+    returncode, _, stderr = await run(cmd, timeout=60)
+    if returncode != 0:
+        raise RuntimeError(f"Failed to activate env '{env_name}': {stderr.decode(errors='replace')}")
+    logger.info("Activated environment: %s", env_name)
+
+    try:
+        _CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        _CACHE_FILE.write_text(
+            json.dumps({"key": key}),
+            encoding="utf-8",
+        )
+    except OSError as e:
+        logger.debug("Could not cache activation of %s: %s", env_name, e)
+
+
+def load_json(path: Path) -> dict:
+    """Return the JSON object stored at ``path``, or an empty dict if it is missing or unreadable."""
+    try:
+        data = json.loads(path.read_bytes())
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def write_json_atomic(path: Path, data: dict) -> None:
+    """Write ``data`` as JSON to ``path`` via a temporary file so readers never see a partial file."""
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    tmp_path.write_text(json.dumps(data, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    os.replace(tmp_path, path)
@@ -10,49 +10,45 @@ Usage:
 """
 
 import argparse
+import asyncio
 import logging
 import os
-import subprocess
 import sys
 from pathlib import Path
 
-logger = logging.getLogger(__name__)
-
+from _wxo import (
+    ORCHESTRATE_BIN,
+    SEPARATOR,
+    build_parser,
+    configure_logging,
+    ensure_environment,
+    positive_int,
+    run,
+    run_main,
+    set_deadline,
+)
 
-def activate_environment(env_name: str, api_key: str | None = None) -> None:
-    """Activate a WXO environment before running CLI commands."""
-    cmd = ["orchestrate", "env", "activate", env_name]
-    if api_key:
-        cmd.extend(["--api-key", api_key])
-    result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
-    if result.returncode != 0:
-        raise RuntimeError(
-            f"Failed to activate env '{env_name}': {result.stderr}"
-        )
-    logger.info("Activated environment: %s", env_name)
+logger = logging.getLogger(__name__)
 
 
-def deploy_agent(agent_name: str) -> bool:
+async def deploy_agent(agent_name: str) -> bool:
     """Deploy an agent from draft to live state."""
     logger.info("Deploying agent %s to live...", agent_name)
     try:
-        result = subprocess.run(
-            ["orchestrate", "agents", "deploy", "--name", agent_name],
-            capture_output=True,
-            text=True,
-            check=False,
+        returncode, stdout, stderr = await run(
+            (ORCHESTRATE_BIN, "agents", "deploy", "--name", agent_name),
             timeout=120,
         )
-        if result.returncode == 0:
+        if returncode == 0:
             logger.info("Successfully deployed %s to live", agent_name)
             return True
         else:
             logger.error(
                 "Failed to deploy %s (return code: %d)\nSTDERR: %s\nSTDOUT: %s",
                 agent_name,
-                result.returncode,
-                result.stderr,
-                result.stdout,
+                returncode,
+                stderr.decode(errors="replace"),
+                stdout.decode(errors="replace"),
             )
             return False
     except Exception as e:
@@ -60,7 +56,7 @@ def deploy_agent(agent_name: str) -> bool:
         return False
 
 
-def import_agent_file(agent_file: Path, do_deploy: bool = False) -> bool:
+async def import_agent_file(agent_file: Path, do_deploy: bool = False) -> bool:
     """Import an agent file using orchestrate agents import.
 
     Args:
@@ -71,125 +67,153 @@ def import_agent_file(agent_file: Path, do_deploy: bool = False) -> bool:
         True if successful, False otherwise.
     """
     logger.info("Importing agent from file: %s", agent_file)
+    # One call per file: `-f` is single-valued and the CLI silently keeps the last
+    # occurrence, so passing several files would import only one of them.
     try:
-        result = subprocess.run(
-            ["orchestrate", "agents", "import", "-f", str(agent_file)],
-            capture_output=True,
-            text=True,
-            check=False,
+        returncode, stdout, stderr = await run(
+            (ORCHESTRATE_BIN, "agents", "import", "-f", str(agent_file)),
             timeout=120,
         )
-        if result.returncode == 0:
+        if returncode == 0:
             logger.info("Successfully imported %s", agent_file.name)
             if do_deploy:
                 agent_name = agent_file.stem
-                if not deploy_agent(agent_name):
+                if not await deploy_agent(agent_name):
                     return False
             return True
         else:
             logger.error(
                 "Failed to import %s (return code: %d)\nSTDERR: %s\nSTDOUT: %s",
                 agent_file.name,
-                result.returncode,
-                result.stderr,
-                result.stdout,
+                returncode,
+                stderr.decode(errors="replace"),
+                stdout.decode(errors="replace"),
             )
             return False
-    except subprocess.TimeoutExpired:
-        logger.error("Timeout while importing %s (exceeded 120 seconds)", agent_file.name)
+    except TimeoutError:
+        logger.error("Timeout while importing %s (exceeded 120 seconds or the --deadline budget)", agent_file.name)
         return False
     except Exception as e:
         logger.error("Unexpected error while importing %s: %s", agent_file.name, e, exc_info=True)
         return False
 
 
-if __name__ == "__main__":
-    parser = argparse.ArgumentParser(
-        description="Export native agents to Watsonx Orchestrate",
-    )
-    parser.add_argument(
-        "--verbose",
-        action="store_true",
-        help="Enable verbose debug logging",
-    )
-    parser.add_argument(
-        "--env",
-        type=str,
-        default=None,
-        help="Name of the WXO environment to activate before import",
-    )
-    parser.add_argument(
-        "--api-key",
-        type=str,
-        default=None,
-        help="API key for non-interactive environment activation (falls back to WXO_API_KEY env var)",
-    )
-    parser.add_argument(
-        "--deploy",
-        action="store_true",
-        help="Deploy agents to live state after importing (draft → live)",
-    )
-    args = parser.parse_args()
+async def import_agent_files(agent_files: list[Path], do_deploy: bool, concurrency: int) -> list[bool | BaseException]:
+    """Import agent files concurrently, running at most ``concurrency`` CLI calls at once.
 
-    logging.basicConfig(
-        level=logging.DEBUG if args.verbose else logging.INFO,
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    )
+    Returns:
+        One result per file, in input order: the import status, or the exception it raised.
+    """
+    sem = asyncio.Semaphore(concurrency)
+
+    async def _bounded(agent_file: Path) -> bool:
+        async with sem:
+            return await import_agent_file(agent_file, do_deploy=do_deploy)
+
+    return await asyncio.gather(*(_bounded(f) for f in agent_files), return_exceptions=True)
+
+
+def find_agent_files(agents_folder: Path) -> list[Path]:
+    """Return the native agent YAML files found under ``agents/<name>/agents/native/``.
+
+    Uses ``os.scandir`` so directory checks come from the cached entry type
+    instead of a ``stat`` call per path.
+    """
+    agent_files = []
+    with os.scandir(agents_folder) as agent_folders:
+        for agent_folder in agent_folders:
+            if not agent_folder.is_dir() or agent_folder.name.startswith(("__", ".")):
+                continue
 
-    logger.info("=" * 60)
+            try:
+                agents_type_entries = os.scandir(os.path.join(agent_folder.path, "agents"))
+            except (FileNotFoundError, NotADirectoryError):
+                logger.warning("Skipping %s: no 'agents' subfolder found", agent_folder.name)
+                continue
+
+            with agents_type_entries:
+                for agent_type_folder in agents_type_entries:
+                    if agent_type_folder.name != "native" or not agent_type_folder.is_dir():
+                        logger.debug("Skipping non-native agent type: %s", agent_type_folder.name)
+                        continue
+
+                    with os.scandir(agent_type_folder.path) as entries:
+                        agent_files.extend(
+                            Path(entry.path) for entry in entries if entry.name.endswith(".yaml") and entry.is_file()
+                        )
+    return agent_files
+
+
+async def main(args: argparse.Namespace) -> int:
+    """Import every native agent YAML under agents/ and return the process exit code."""
+    logger.info(SEPARATOR)
     logger.info("Starting agent export process to Watsonx Orchestrate")
-    logger.info("=" * 60)
+    logger.info(SEPARATOR)
 
     # Activate target environment if specified
     if args.env:
         api_key = args.api_key or os.environ.get("WXO_API_KEY")
-        activate_environment(args.env, api_key)
+        await ensure_environment(args.env, api_key)
 
     agents_folder = (Path(__file__).parent.parent / "agents").resolve()
     logger.info("Scanning agents folder: %s", agents_folder)
 
     if not agents_folder.exists():
         logger.error("Agents folder not found: %s", agents_folder)
-        sys.exit(1)
-
-    success_count = 0
-    failed_agents = []
-    total_count = 0
+        return 1
 
-    for agent_folder in agents_folder.iterdir():
-        if not agent_folder.is_dir() or agent_folder.name.startswith(("__", ".")):
-            continue
+    agent_files = find_agent_files(agents_folder)
+    for idx, agent_file in enumerate(agent_files, 1):
+        logger.info("Processing agent file %d: %s", idx, agent_file.name)
 
-        agents_type_path = agent_folder / "agents"
-        if not agents_type_path.exists():
-            logger.warning("Skipping %s: no 'agents' subfolder found", agent_folder.name)
-            continue
+    total_count = len(agent_files)
+    results = await import_agent_files(agent_files, args.deploy, args.concurrency)
 
-        for agent_type_folder in agents_type_path.iterdir():
-            if agent_type_folder.name != "native":
-                logger.debug("Skipping non-native agent type: %s", agent_type_folder.name)
-                continue
+    success_count = 0
+    failed_agents = []
+    for agent_file, result in zip(agent_files, results, strict=True):
+        if isinstance(result, BaseException):
+            logger.error("Failed to process %s: %s", agent_file.name, result, exc_info=result)
+            failed_agents.append(agent_file.name)
+        elif result:
+            success_count += 1
+        else:
+            failed_agents.append(agent_file.name)
 
-            for agent_file in agent_type_folder.glob("*.yaml"):
-                total_count += 1
-                logger.info("Processing agent file %d: %s", total_count, agent_file.name)
-
-                try:
-                    success = import_agent_file(agent_file, do_deploy=args.deploy)
-                    if success:
-                        success_count += 1
-                    else:
-                        failed_agents.append(agent_file.name)
-                except Exception as e:
-                    logger.error("Failed to process %s: %s", agent_file.name, e, exc_info=True)
-                    failed_agents.append(agent_file.name)
-
-    logger.info("=" * 60)
+    logger.info(SEPARATOR)
     logger.info("Export process completed")
     logger.info("Successfully exported: %d/%d agents", success_count, total_count)
     if failed_agents:
         logger.warning("Failed agents (%d): %s", len(failed_agents), ", ".join(failed_agents))
-    logger.info("=" * 60)
+    logger.info(SEPARATOR)
 
-    if failed_agents:
-        sys.exit(1)
+    return 1 if failed_agents else 0
+
+
+if __name__ == "__main__":
+    parser = build_parser(
+        description="Export native agents to Watsonx Orchestrate",
+    )
+    parser.add_argument(
+        "--deploy",
+        action="store_true",
+        help="Deploy agents to live state after importing (draft → live)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=positive_int,
+        default=8,
+        help="Maximum number of agents imported in parallel (default: 8)",
+    )
+    parser.add_argument(
+        "--deadline",
+        type=float,
+        default=1800,
+        help="Overall time budget in seconds for all orchestrate calls (default: 1800)",
+    )
+    args = parser.parse_args()
+
+    configure_logging(args.verbose)
+
+    set_deadline(args.deadline)
+    sys.exit(run_main(main(args)))
@@ -8,29 +8,28 @@ Usage:
 """
 
 import argparse
+import asyncio
 import logging
 import os
-import subprocess
 import sys
 from pathlib import Path
 
-logger = logging.getLogger(__name__)
-
+from _wxo import (
+    ORCHESTRATE_BIN,
+    SEPARATOR,
+    build_parser,
+    configure_logging,
+    ensure_environment,
+    positive_int,
+    run,
+    run_main,
+    set_deadline,
+)
 
-def activate_environment(env_name: str, api_key: str | None = None) -> None:
-    """Activate a WXO environment before running CLI commands."""
-    cmd = ["orchestrate", "env", "activate", env_name]
-    if api_key:
-        cmd.extend(["--api-key", api_key])
-    result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
-    if result.returncode != 0:
-        raise RuntimeError(
-            f"Failed to activate env '{env_name}': {result.stderr}"
-        )
-    logger.info("Activated environment: %s", env_name)
+logger = logging.getLogger(__name__)
 
 
-def import_tool(tool_dir: Path) -> bool:
+async def import_tool(tool_dir: Path) -> bool:
     """Import a tool folder using orchestrate tools import.
 
     Returns:
@@ -45,8 +44,18 @@ def import_tool(tool_dir: Path) -> bool:
         logger.warning("Skipping %s: %s does not exist.", tool_dir.name, tool_file.name)
         return False
 
-    cmd = [
-        "orchestrate",
+    if not requirements_file.exists():
+        logger.error(
+            "Skipping %s: requirements.txt is missing and is required.",
+            tool_name,
+        )
+        return False
+    logger.info("Using tool-specific requirements.txt for %s", tool_name)
+
+    # One call per tool: `-f`, `-p` and `-r` are single-valued and each tool has its
+    # own package root and requirements, so imports cannot be batched.
+    cmd = (
+        ORCHESTRATE_BIN,
         "tools",
         "import",
         "-k",
@@ -55,84 +64,59 @@ def import_tool(tool_dir: Path) -> bool:
         str(tool_file),
         "-p",
         str(tool_dir),
-    ]
-
-    if requirements_file.exists():
-        cmd.extend(["-r", str(requirements_file)])
-        logger.info("Using tool-specific requirements.txt for %s", tool_name)
-    else:
-        logger.error(
-            "Skipping %s: requirements.txt is missing and is required.",
-            tool_name,
-        )
-        return False
+        "-r",
+        str(requirements_file),
+    )
 
     logger.info("Importing tool: %s from %s", tool_name, tool_file)
     try:
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            check=False,
-            timeout=120,
-        )
+        returncode, stdout, stderr = await run(cmd, timeout=120)
 
-        if result.returncode == 0:
+        if returncode == 0:
             logger.info("Successfully imported %s", tool_name)
             return True
         else:
             logger.error(
                 "Failed to import %s (return code: %d)\nSTDERR: %s\nSTDOUT: %s",
                 tool_name,
-                result.returncode,
-                result.stderr,
-                result.stdout,
+                returncode,
+                stderr.decode(errors="replace"),
+                stdout.decode(errors="replace"),
             )
             return False
-    except subprocess.TimeoutExpired:
-        logger.error("Timeout while importing %s (exceeded 120 seconds)", tool_name)
+    except TimeoutError:
+        logger.error("Timeout while importing %s (exceeded 120 seconds or the --deadline budget)", tool_name)
         return False
     except Exception as e:
         logger.error("Unexpected error while importing %s: %s", tool_name, e, exc_info=True)
         return False
 
 
-if __name__ == "__main__":
-    parser = argparse.ArgumentParser(
-        description="Export tools to Watsonx Orchestrate",
-    )
-    parser.add_argument(
-        "--verbose",
-        action="store_true",
-        help="Enable verbose debug logging",
-    )
-    parser.add_argument(
-        "--env",
-        type=str,
-        default=None,
-        help="Name of the WXO environment to activate before import",
-    )
-    parser.add_argument(
-        "--api-key",
-        type=str,
-        default=None,
-        help="API key for non-interactive environment activation (falls back to WXO_API_KEY env var)",
-    )
-    args = parser.parse_args()
+async def import_tools(tool_dirs: list[Path], concurrency: int) -> list[bool | BaseException]:
+    """Import tool folders concurrently, running at most ``concurrency`` CLI calls at once.
 
-    logging.basicConfig(
-        level=logging.DEBUG if args.verbose else logging.INFO,
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    )
+    Returns:
+        One result per folder, in input order: the import status, or the exception it raised.
+    """
+    sem = asyncio.Semaphore(concurrency)
+
+    async def _bounded(tool_dir: Path) -> bool:
+        async with sem:
+            return await import_tool(tool_dir)
+
+    return await asyncio.gather(*(_bounded(d) for d in tool_dirs), return_exceptions=True)
 
-    logger.info("=" * 60)
+
+async def main(args: argparse.Namespace) -> int:
+    """Import every tool folder under tools/ and return the process exit code."""
+    logger.info(SEPARATOR)
     logger.info("Starting tool export process to Watsonx Orchestrate")
-    logger.info("=" * 60)
+    logger.info(SEPARATOR)
 
     # Activate target environment if specified
     if args.env:
         api_key = args.api_key or os.environ.get("WXO_API_KEY")
-        activate_environment(args.env, api_key)
+        await ensure_environment(args.env, api_key)
 
     project_root = Path(__file__).parent.parent.resolve()
     tools_folder = project_root / "tools"
@@ -140,42 +124,66 @@ if __name__ == "__main__":
 
     if not tools_folder.exists():
         logger.error("Tools folder not found: %s", tools_folder)
-        sys.exit(1)
-
-    success_count = 0
-    failed_tools = []
-    total_count = 0
+        return 1
 
+    tool_directories = []
     for tool_directory in tools_folder.iterdir():
         if (
             tool_directory.is_dir()
             and not tool_directory.name.startswith("__")
             and not tool_directory.name.startswith(".")
         ):
-            total_count += 1
-            logger.info("Processing tool %d: %s", total_count, tool_directory.name)
-
-            try:
-                success = import_tool(tool_directory)
-                if success:
-                    success_count += 1
-                else:
-                    failed_tools.append(tool_directory.name)
-            except Exception as e:
-                logger.error(
-                    "Failed to process tool %s: %s",
-                    tool_directory.name,
-                    e,
-                    exc_info=True,
-                )
-                failed_tools.append(tool_directory.name)
-
-    logger.info("=" * 60)
+            tool_directories.append(tool_directory)
+            logger.info("Processing tool %d: %s", len(tool_directories), tool_directory.name)
+
+    total_count = len(tool_directories)
+    results = await import_tools(tool_directories, args.concurrency)
+
+    success_count = 0
+    failed_tools = []
+    for tool_directory, result in zip(tool_directories, results, strict=True):
+        if isinstance(result, BaseException):
+            logger.error(
+                "Failed to process tool %s: %s",
+                tool_directory.name,
+                result,
+                exc_info=result,
+            )
+            failed_tools.append(tool_directory.name)
+        elif result:
+            success_count += 1
+        else:
+            failed_tools.append(tool_directory.name)
+
+    logger.info(SEPARATOR)
     logger.info("Export process completed")
     logger.info("Successfully exported: %d/%d tools", success_count, total_count)
     if failed_tools:
         logger.warning("Failed tools (%d): %s", len(failed_tools), ", ".join(failed_tools))
-    logger.info("=" * 60)
+    logger.info(SEPARATOR)
 
-    if failed_tools:
-        sys.exit(1)
+    return 1 if failed_tools else 0
+
+
+if __name__ == "__main__":
+    parser = build_parser(
+        description="Export tools to Watsonx Orchestrate",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=positive_int,
+        default=8,
+        help="Maximum number of tools imported in parallel (default: 8)",
+    )
+    parser.add_argument(
+        "--deadline",
+        type=float,
+        default=1800,
+        help="Overall time budget in seconds for all orchestrate calls (default: 1800)",
+    )
+    args = parser.parse_args()
+
+    configure_logging(args.verbose)
+
+    set_deadline(args.deadline)
+    sys.exit(run_main(main(args)))
@@ -7,54 +7,66 @@ Usage:
 """
 
 import argparse
+import asyncio
+import hashlib
 import json
 import logging
 import os
-import subprocess
+import random
+import re
 import sys
-import time
 from pathlib import Path
 
 import yaml
+from _wxo import (
+    ORCHESTRATE_BIN,
+    SEPARATOR,
+    DeadlineExceeded,
+    build_parser,
+    configure_logging,
+    ensure_environment,
+    load_json,
+    positive_int,
+    run,
+    run_main,
+    set_deadline,
+    sleep_before_retry,
+    write_json_atomic,
+)
+
+try:
+    from yaml import CSafeDumper as YamlDumper
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeDumper as YamlDumper
 
 logger = logging.getLogger(__name__)
 
+_LLM_CONFIG_KEY = re.compile(rb"^llm_config:", re.MULTILINE)
 
-def activate_environment(env_name: str, api_key: str | None = None) -> None:
-    """Activate a WXO environment before running CLI commands."""
-    cmd = ["orchestrate", "env", "activate", env_name]
-    if api_key:
-        cmd.extend(["--api-key", api_key])
-    result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
-    if result.returncode != 0:
-        raise RuntimeError(
-            f"Failed to activate env '{env_name}': {result.stderr}"
-        )
-    logger.info("Activated environment: %s", env_name)
+# Maps agent name -> hash of its `agents list` entry as of the last successful export.
+EXPORT_CACHE_FILE = ".export_cache.json"
 
 
-def run_orchestrate_agents_list():
+async def run_orchestrate_agents_list():
     """Run the orchestrate agents list command and return parsed JSON."""
     logger.info("Fetching list of native agents from Watsonx Orchestrate...")
     try:
-        result = subprocess.run(
-            ["orchestrate", "agents", "list", "--kind", "native", "-v"],
-            capture_output=True,
-            text=True,
+        returncode, stdout, stderr = await run(
+            (ORCHESTRATE_BIN, "agents", "list", "--kind", "native", "-v"),
             timeout=60,
         )
-        if result.returncode != 0:
+        if returncode != 0:
             logger.error(
                 "Failed to list agents (return code: %d)\nSTDERR: %s\nSTDOUT: %s",
-                result.returncode,
-                result.stderr,
-                result.stdout,
+                returncode,
+                stderr.decode(errors="replace"),
+                stdout.decode(errors="replace"),
             )
             return None
         logger.info("Successfully retrieved agents list")
-        return json.loads(result.stdout)
-    except subprocess.TimeoutExpired:
-        logger.error("Timeout while listing agents (exceeded 60 seconds)")
+        return json.loads(stdout)
+    except TimeoutError:
+        logger.error("Timeout while listing agents (exceeded 60 seconds or the --deadline budget)")
         return None
     except json.JSONDecodeError as e:
         logger.error("Failed to parse JSON response: %s", e)
@@ -64,7 +76,32 @@ def run_orchestrate_agents_list():
         return None
 
 
-def export_and_extract_agent(
+def _enrich_yaml(path: Path, llm_config: dict) -> bool:
+    """Append a top-level ``llm_config`` block to an exported agent YAML unless it already has one.
+
+    Returns:
+        True if the block was added, False if the file already defined ``llm_config``.
+    """
+    content = path.read_bytes()
+    # The export is a block-style mapping, so a top-level key always starts a line
+    if _LLM_CONFIG_KEY.search(content):
+        return False
+    block = yaml.dump(
+        {"llm_config": llm_config},
+        Dumper=YamlDumper,
+        encoding="utf-8",
+        default_flow_style=False,
+        allow_unicode=True,
+        sort_keys=False,
+    )
+    with open(path, "ab") as f:
+        if content and not content.endswith(b"\n"):
+            f.write(b"\n")
+        f.write(block)
+    return True
+
+
+async def export_and_extract_agent(
     agent_name: str,
     project_root: Path,
     max_retries: int = 3,
@@ -77,6 +114,9 @@ def export_and_extract_agent(
         project_root: Root directory of the project.
         max_retries: Maximum number of retry attempts for timeouts.
         agent_data: Full agent data from agents list (used to add LLM config).
+
+    Returns:
+        True if the YAML was exported and enriched, False otherwise.
     """
     logger.info("Starting export for agent: %s", agent_name)
 
@@ -84,8 +124,8 @@ def export_and_extract_agent(
     agents_dir.mkdir(parents=True, exist_ok=True)
     output_path = agents_dir / f"{agent_name}.yaml"
 
-    command = [
-        "orchestrate",
+    command = (
+        ORCHESTRATE_BIN,
         "agents",
         "export",
         "-n",
@@ -95,37 +135,33 @@ def export_and_extract_agent(
         "-o",
         str(output_path),
         "--agent-only",
-    ]
+    )
 
     for attempt in range(1, max_retries + 1):
         try:
             if attempt > 1:
                 logger.info("Retry attempt %d/%d for agent: %s", attempt, max_retries, agent_name)
-                time.sleep(5 * attempt)
+                # Jitter spreads out agents that timed out together so they do not retry in lockstep
+                await sleep_before_retry(5 * attempt + random.uniform(0, 1) * attempt)  # noqa: S311
 
-            result = subprocess.run(
-                command,
-                capture_output=True,
-                text=True,
-                timeout=300,
-            )
-            if result.returncode != 0:
+            returncode, stdout, stderr = await run(command, timeout=300)
+            if returncode != 0:
                 logger.error(
                     "Failed to export agent %s (return code: %d)\nSTDERR: %s\nSTDOUT: %s",
                     agent_name,
-                    result.returncode,
-                    result.stderr,
-                    result.stdout,
+                    returncode,
+                    stderr.decode(errors="replace"),
+                    stdout.decode(errors="replace"),
                 )
                 return False
             logger.info("Successfully exported agent %s to %s", agent_name, output_path)
             break
-        except subprocess.TimeoutExpired:
+        except DeadlineExceeded:
+            logger.error("Gave up exporting agent %s: the --deadline budget is spent", agent_name)
+            return False
+        except TimeoutError:
             if attempt < max_retries:
-                logger.warning(
-                    "Timeout while exporting agent %s (exceeded 300 seconds). Retrying...",
-                    agent_name,
-                )
+                logger.warning("Timeout while exporting agent %s (exceeded 300 seconds). Retrying...", agent_name)
                 continue
             else:
                 logger.error(
@@ -139,88 +175,66 @@ def export_and_extract_agent(
             return False
 
     # Enrich YAML with LLM config from agent data if available
-    if agent_data and output_path.exists():
+    llm_config = (agent_data or {}).get("llm_config") or {}
+    filtered_config = {k: v for k, v in llm_config.items() if v is not None}
+    if filtered_config and output_path.exists():
         try:
-            with open(output_path, "r", encoding="utf-8") as f:
-                yaml_content = yaml.safe_load(f)
-
-            llm_config = agent_data.get("llm_config", {})
-            if llm_config and "llm_config" not in yaml_content:
-                filtered_config = {k: v for k, v in llm_config.items() if v is not None}
-                if filtered_config:
-                    yaml_content["llm_config"] = filtered_config
-                    with open(output_path, "w", encoding="utf-8") as f:
-                        yaml.dump(
-                            yaml_content,
-                            f,
-                            default_flow_style=False,
-                            allow_unicode=True,
-                            sort_keys=False,
-                        )
-                    logger.info("Added LLM config to %s", agent_name)
+            # File I/O runs in a worker thread so other exports keep progressing
+            if await asyncio.to_thread(_enrich_yaml, output_path, filtered_config):
+                logger.info("Added LLM config to %s", agent_name)
         except Exception as e:
-            logger.warning("Could not add LLM config to %s: %s", agent_name, e)
+            # Not cached as imported, so the next run exports and enriches it again
+            logger.error("Could not add LLM config to %s: %s", agent_name, e)
+            return False
 
     logger.info("Agent %s YAML saved to %s", agent_name, output_path)
     return True
 
 
-if __name__ == "__main__":
-    parser = argparse.ArgumentParser(
-        description="Import native agents from Watsonx Orchestrate (agent-only mode)",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
-Examples:
-  python scripts/import_agents_from_orchestrate.py --env wxo_test --verbose
-  python scripts/import_agents_from_orchestrate.py --retries 5
-        """,
-    )
-    parser.add_argument(
-        "--retries",
-        type=int,
-        default=3,
-        help="Maximum number of retry attempts for timeouts (default: 3)",
-    )
-    parser.add_argument(
-        "--verbose",
-        action="store_true",
-        help="Enable verbose debug logging",
-    )
-    parser.add_argument(
-        "--env",
-        type=str,
-        default=None,
-        help="Name of the WXO environment to activate before import",
-    )
-    parser.add_argument(
-        "--api-key",
-        type=str,
-        default=None,
-        help="API key for non-interactive environment activation (falls back to WXO_API_KEY env var)",
-    )
-    args = parser.parse_args()
+def agent_fingerprint(agent_data: dict) -> str:
+    """Hash an agent's `agents list` entry; it changes whenever the agent changes upstream."""
+    return hashlib.blake2b(json.dumps(agent_data, sort_keys=True, default=str).encode()).hexdigest()
 
-    logging.basicConfig(
-        level=logging.DEBUG if args.verbose else logging.INFO,
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    )
-    logger.info("=" * 60)
+
+async def export_agents(
+    agents: list[dict],
+    project_root: Path,
+    max_retries: int,
+    concurrency: int,
+) -> list[bool | BaseException]:
+    """Export agents concurrently, running at most ``concurrency`` CLI calls at once.
+
+    Returns:
+        One result per agent, in input order: the export status, or the exception it raised.
+    """
+    sem = asyncio.Semaphore(concurrency)
+
+    async def _bounded(agent: dict) -> bool:
+        async with sem:
+            return await export_and_extract_agent(agent["name"], project_root, max_retries, agent_data=agent)
+
+    return await asyncio.gather(*(_bounded(a) for a in agents), return_exceptions=True)
+
+
+async def main(args: argparse.Namespace) -> int:
+    """Export every live native agent into agents/ and return the process exit code."""
+    logger.info(SEPARATOR)
     logger.info("Starting agent import process from Watsonx Orchestrate")
     logger.info("Max retry attempts: %d", args.retries)
-    logger.info("=" * 60)
+    logger.info(SEPARATOR)
 
     # Activate target environment if specified
     if args.env:
         api_key = args.api_key or os.environ.get("WXO_API_KEY")
-        activate_environment(args.env, api_key)
+        await ensure_environment(args.env, api_key)
 
     project_root = Path(__file__).parent.parent.resolve()
     logger.info("Project root: %s", project_root)
 
-    data = run_orchestrate_agents_list()
+    data = await run_orchestrate_agents_list()
     if not data:
         logger.error("Failed to retrieve agents list. Exiting.")
-        sys.exit(1)
+        return 1
 
     native_agents = data.get("native", [])
     logger.info("Found %d total native agent(s)", len(native_agents))
@@ -233,34 +247,95 @@ Examples:
         hidden_count = len(native_agents) - len(live_agents)
         logger.info("Skipping %d hidden agent(s)", hidden_count)
 
-    success_count = 0
-    failed_agents = []
+    cache_path = project_root / "agents" / EXPORT_CACHE_FILE
+    export_cache = {} if args.force else load_json(cache_path)
+    new_cache = {}
 
+    named_agents = []
     for idx, agent in enumerate(live_agents, 1):
         agent_name = agent.get("name")
         if not agent_name:
             logger.warning("Skipping agent at index %d (no name found)", idx)
             continue
 
+        fingerprint = agent_fingerprint(agent)
+        output_path = project_root / "agents" / agent_name / "agents" / "native" / f"{agent_name}.yaml"
+        if export_cache.get(agent_name) == fingerprint and output_path.exists():
+            logger.info("Agent %d/%d unchanged since last import: %s", idx, len(live_agents), agent_name)
+            new_cache[agent_name] = fingerprint
+            continue
+
         logger.info("Processing agent %d/%d: %s", idx, len(live_agents), agent_name)
-        try:
-            success = export_and_extract_agent(
-                agent_name, project_root, args.retries, agent_data=agent
-            )
-            if success:
-                success_count += 1
-            else:
-                failed_agents.append(agent_name)
-        except Exception as e:
-            logger.error("Failed to process agent %s: %s", agent_name, e, exc_info=True)
-            failed_agents.append(agent_name)
+        named_agents.append((agent, fingerprint))
+
+    unchanged_count = len(new_cache)
+    results = await export_agents([agent for agent, _ in named_agents], project_root, args.retries, args.concurrency)
 
-    logger.info("=" * 60)
+    success_count = unchanged_count
+    failed_agents = []
+    for (agent, fingerprint), result in zip(named_agents, results, strict=True):
+        if isinstance(result, BaseException):
+            logger.error("Failed to process agent %s: %s", agent["name"], result, exc_info=result)
+            failed_agents.append(agent["name"])
+        elif result:
+            success_count += 1
+            new_cache[agent["name"]] = fingerprint
+        else:
+            failed_agents.append(agent["name"])
+
+    try:
+        write_json_atomic(cache_path, new_cache)
+    except OSError as e:
+        logger.warning("Could not write export cache %s: %s", cache_path, e)
+
+    logger.info(SEPARATOR)
     logger.info("Import process completed")
     logger.info("Successfully imported: %d/%d live agents", success_count, len(live_agents))
+    if unchanged_count:
+        logger.info("Unchanged since last import (not re-exported): %d", unchanged_count)
     if failed_agents:
         logger.warning("Failed agents (%d): %s", len(failed_agents), ", ".join(failed_agents))
-    logger.info("=" * 60)
+    logger.info(SEPARATOR)
 
-    if failed_agents:
-        sys.exit(1)
+    return 1 if failed_agents else 0
+
+
+if __name__ == "__main__":
+    parser = build_parser(
+        description="Import native agents from Watsonx Orchestrate (agent-only mode)",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python scripts/import_agents_from_orchestrate.py --env wxo_test --verbose
+  python scripts/import_agents_from_orchestrate.py --retries 5
+        """,
+    )
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=3,
+        help="Maximum number of retry attempts for timeouts (default: 3)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=positive_int,
+        default=4,
+        help="Maximum number of agents exported in parallel (default: 4)",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-export every agent, even those unchanged since the last import",
+    )
+    parser.add_argument(
+        "--deadline",
+        type=float,
+        default=1800,
+        help="Overall time budget in seconds for all orchestrate calls (default: 1800)",
+    )
+    args = parser.parse_args()
+
+    configure_logging(args.verbose)
+
+    set_deadline(args.deadline)
+    sys.exit(run_main(main(args)))
@@ -7,56 +7,70 @@ Usage:
 """
 
 import argparse
+import asyncio
+import contextlib
+import errno
 import json
 import logging
 import os
 import shutil
-import subprocess
+import stat
 import sys
-import time
 import zipfile
 from pathlib import Path
 from typing import Any
 
+from _wxo import (
+    ORCHESTRATE_BIN,
+    SEPARATOR,
+    DeadlineExceeded,
+    build_parser,
+    configure_logging,
+    ensure_environment,
+    positive_int,
+    run,
+    run_main,
+    set_deadline,
+    sleep_before_retry,
+)
+
+try:
+    from orjson import loads as json_loads
+except ImportError:  # optional, installed with the "speedups" extra
+    json_loads = json.loads
+
 logger = logging.getLogger(__name__)
 
+# Parsed output of the last successful `orchestrate tools list`, reused for the rest of the run.
+_tools_list: list[dict[str, Any]] | dict[str, Any] | None = None
+
 
-def activate_environment(env_name: str, api_key: str | None = None) -> None:
-    """Activate a WXO environment before running CLI commands."""
-    cmd = ["orchestrate", "env", "activate", env_name]
-    if api_key:
-        cmd.extend(["--api-key", api_key])
-    result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
-    if result.returncode != 0:
-        raise RuntimeError(
-            f"Failed to activate env '{env_name}': {result.stderr}"
-        )
-    logger.info("Activated environment: %s", env_name)
+async def run_orchestrate_tools_list() -> list[dict[str, Any]] | dict[str, Any] | None:
+    """Run the orchestrate tools list command and return parsed JSON.
 
+    A successful result is memoized for the lifetime of the process, so repeated
+    calls do not spawn the CLI again.
+    """
+    global _tools_list
+    if _tools_list is not None:
+        return _tools_list
 
-def run_orchestrate_tools_list() -> list[dict[str, Any]] | dict[str, Any] | None:
-    """Run the orchestrate tools list command and return parsed JSON."""
     logger.info("Fetching list of tools from Watsonx Orchestrate...")
     try:
-        result = subprocess.run(
-            ["orchestrate", "tools", "list", "-v"],
-            capture_output=True,
-            text=True,
-            check=False,
-            timeout=60,
-        )
-        if result.returncode != 0:
+        returncode, stdout, stderr = await run((ORCHESTRATE_BIN, "tools", "list", "-v"), timeout=60)
+        if returncode != 0:
             logger.error(
                 "Failed to list tools (return code: %d)\nSTDERR: %s\nSTDOUT: %s",
-                result.returncode,
-                result.stderr,
-                result.stdout,
+                returncode,
+                stderr.decode(errors="replace"),
+                stdout.decode(errors="replace"),
             )
             return None
+        _tools_list = json_loads(stdout)
         logger.info("Successfully retrieved tools list")
-        return json.loads(result.stdout)
-    except subprocess.TimeoutExpired:
-        logger.error("Timeout while listing tools (exceeded 60 seconds)")
+        return _tools_list
+    except TimeoutError:
+        logger.error("Timeout while listing tools (exceeded 60 seconds or the --deadline budget)")
         return None
     except json.JSONDecodeError as e:
         logger.error("Failed to parse JSON response: %s", e)
@@ -66,64 +80,129 @@ def run_orchestrate_tools_list() -> list[dict[str, Any]] | dict[str, Any] | None
         return None
 
 
-def export_and_extract_tool(tool_name: str, project_root: Path, max_retries: int = 3) -> bool:
-    """Export a tool as a zip and extract all files into the tools/ folder.
-
-    Args:
-        tool_name: Name of the tool to export.
-        project_root: Root directory of the project.
-        max_retries: Maximum number of retry attempts for timeouts.
+def _write_members(zip_ref: zipfile.ZipFile, root: str) -> set[tuple[int, int]]:
+    """Write every member of ``zip_ref`` under ``root``, overwriting existing files.
 
     Returns:
-        True if successful, False otherwise.
+        The (device, inode) of every file and folder written, including ``root``.
+        Identities rather than paths are used so that a name differing only in
+        case still matches on case-insensitive filesystems.
     """
-    tools_dir = project_root / "tools"
-    tools_dir.mkdir(parents=True, exist_ok=True)
-    zip_path = tools_dir / f"{tool_name}.zip"
+    root_stat = os.stat(root)
+    kept = {(root_stat.st_dev, root_stat.st_ino)}
+    # Folders known to exist, so makedirs only runs the first time a folder is seen
+    folders = {root}
+    for member in zip_ref.infolist():
+        target = os.path.normpath(os.path.join(root, member.filename))
+        if target != root and not target.startswith(root + os.sep):
+            raise zipfile.BadZipFile(f"Refusing to extract {member.filename!r} outside {root}")
+        folder = target if member.is_dir() else os.path.dirname(target)
+        missing = []
+        while folder not in folders:
+            missing.append(folder)
+            folder = os.path.dirname(folder)
+        # Top-down with lstat, so nothing is ever created through a symlink
+        for folder in reversed(missing):
+            with contextlib.suppress(FileExistsError):
+                os.mkdir(folder)
+            st = os.lstat(folder)
+            if not stat.S_ISDIR(st.st_mode):
+                raise NotADirectoryError(errno.ENOTDIR, "Not a real folder", folder)
+            folders.add(folder)
+            kept.add((st.st_dev, st.st_ino))
+        if not member.is_dir():
+            if os.path.islink(target):
+                os.unlink(target)
+            with zip_ref.open(member) as src, open(target, "wb") as dst:
+                shutil.copyfileobj(src, dst, length=1 << 20)
+                st = os.fstat(dst.fileno())
+            kept.add((st.st_dev, st.st_ino))
+    return kept
+
+
+def _remove_unkept(folder: str, kept: set[tuple[int, int]]) -> None:
+    """Delete everything under ``folder`` whose (device, inode) is not in ``kept``."""
+    with os.scandir(folder) as entries:
+        for entry in entries:
+            # os.lstat rather than entry.stat(): DirEntry leaves st_ino at 0 on Windows
+            st = os.lstat(entry.path)
+            if entry.is_dir(follow_symlinks=False):
+                _remove_unkept(entry.path, kept)
+                if (st.st_dev, st.st_ino) not in kept:
+                    os.rmdir(entry.path)
+            elif (st.st_dev, st.st_ino) not in kept:
+                logger.debug("Removing file no longer in the tool archive: %s", entry.path)
+                os.unlink(entry.path)
+
+
+def _extract_tool(zip_path: Path, extract_path: Path) -> None:
+    """Make ``extract_path`` mirror the files in ``zip_path``.
+
+    Members are written over any existing files in a single pass, then files
+    and empty folders that are no longer in the archive are removed. This
+    avoids deleting and recreating the whole folder on every import. If a path
+    changed type since the last import (``foo.py`` became a ``foo/`` package, or
+    the reverse) or a folder is a symlink, the folder is cleared and extracted
+    from scratch instead. Symlinks are never followed, so nothing is written
+    outside ``extract_path``.
+
+    Raises:
+        zipfile.BadZipFile: If the archive is invalid or a member would be
+            written outside ``extract_path``.
+    """
+    root = os.path.abspath(extract_path)
+    if os.path.islink(root):
+        os.unlink(root)
+    with contextlib.suppress(FileExistsError):
+        os.mkdir(root)
+    with zipfile.ZipFile(zip_path, "r") as zip_ref:
+        try:
+            kept = _write_members(zip_ref, root)
+        # PermissionError is what Windows raises when opening a folder for writing
+        except (FileExistsError, IsADirectoryError, NotADirectoryError, PermissionError) as e:
+            logger.debug("Re-extracting %s from scratch: %s", root, e)
+            shutil.rmtree(root)
+            os.mkdir(root)
+            kept = _write_members(zip_ref, root)
+    _remove_unkept(root, kept)
 
-    logger.info("Starting export for tool: %s", tool_name)
 
+async def _export_tool(tool_name: str, zip_path: Path, max_retries: int) -> bool:
+    """Export a tool to ``zip_path``, retrying on timeouts.
+
+    Returns:
+        True if the archive was written, False otherwise.
+    """
     for attempt in range(1, max_retries + 1):
         try:
             if attempt > 1:
                 logger.info("Retry attempt %d/%d for tool: %s", attempt, max_retries, tool_name)
-                time.sleep(3 * attempt)
-
-            result = subprocess.run(
-                [
-                    "orchestrate",
-                    "tools",
-                    "export",
-                    "-n",
-                    tool_name,
-                    "-o",
-                    str(zip_path),
-                ],
-                capture_output=True,
-                text=True,
-                check=False,
+                await sleep_before_retry(3 * attempt)
+
+            returncode, stdout, stderr = await run(
+                (ORCHESTRATE_BIN, "tools", "export", "-n", tool_name, "-o", str(zip_path)),
                 timeout=180,
             )
 
-            if result.returncode != 0:
+            if returncode != 0:
                 logger.error(
                     "Failed to export tool %s (return code: %d)\nSTDERR: %s\nSTDOUT: %s",
                     tool_name,
-                    result.returncode,
-                    result.stderr,
-                    result.stdout,
+                    returncode,
+                    stderr.decode(errors="replace"),
+                    stdout.decode(errors="replace"),
                 )
                 return False
 
             logger.info("Successfully exported tool %s", tool_name)
-            break
+            return True
 
-        except subprocess.TimeoutExpired:
+        except DeadlineExceeded:
+            logger.error("Gave up exporting tool %s: the --deadline budget is spent", tool_name)
+            return False
+        except TimeoutError:
             if attempt < max_retries:
-                logger.warning(
-                    "Timeout while exporting tool %s (exceeded 180 seconds). Retrying...",
-                    tool_name,
-                )
+                logger.warning("Timeout while exporting tool %s (exceeded 180 seconds). Retrying...", tool_name)
                 continue
             else:
                 logger.error(
@@ -135,18 +214,34 @@ def export_and_extract_tool(tool_name: str, project_root: Path, max_retries: int
         except Exception as e:
             logger.error("Unexpected error while exporting tool %s: %s", tool_name, e, exc_info=True)
             return False
+    return False
 
-    # Extract zip
-    extract_path = tools_dir / tool_name
-    if extract_path.exists():
-        logger.debug("Removing existing tool directory: %s", extract_path)
-        shutil.rmtree(extract_path)
-    extract_path.mkdir(parents=True, exist_ok=True)
 
+async def export_and_extract_tool(tool_name: str, project_root: Path, max_retries: int = 3) -> bool:
+    """Export a tool as a zip and extract all files into the tools/ folder.
+
+    Args:
+        tool_name: Name of the tool to export.
+        project_root: Root directory of the project; its tools/ folder must exist.
+        max_retries: Maximum number of retry attempts for timeouts.
+
+    Returns:
+        True if successful, False otherwise.
+    """
+    tools_dir = project_root / "tools"
+    # `tools export` only writes to a path ending in .zip (it has no stdout mode),
+    # so the archive has to round-trip through a temporary file.
+    zip_path = tools_dir / f"{tool_name}.zip"
+
+    logger.info("Starting export for tool: %s", tool_name)
+    if not await _export_tool(tool_name, zip_path, max_retries):
+        return False
+
+    # Extract zip off the event loop so other exports keep making progress
+    extract_path = tools_dir / tool_name
     try:
         logger.info("Extracting tool %s to %s", tool_name, extract_path)
-        with zipfile.ZipFile(zip_path, "r") as zip_ref:
-            zip_ref.extractall(extract_path)
+        await asyncio.to_thread(_extract_tool, zip_path, extract_path)
         logger.info("Successfully extracted %s to %s", tool_name, extract_path)
         return True
     except zipfile.BadZipFile:
@@ -159,75 +254,64 @@ def export_and_extract_tool(tool_name: str, project_root: Path, max_retries: int
         logger.exception("Unexpected error while extracting tool %s: %s", tool_name, e)
         return False
     finally:
-        if zip_path.exists():
-            zip_path.unlink(missing_ok=True)
-            logger.debug("Cleaned up temporary zip file: %s", zip_path)
+        zip_path.unlink(missing_ok=True)
+        logger.debug("Cleaned up temporary zip file: %s", zip_path)
 
 
-if __name__ == "__main__":
-    parser = argparse.ArgumentParser(
-        description="Import tools from Watsonx Orchestrate",
-    )
-    parser.add_argument(
-        "--retries",
-        type=int,
-        default=3,
-        help="Maximum number of retry attempts for timeouts (default: 3)",
-    )
-    parser.add_argument(
-        "--verbose",
-        action="store_true",
-        help="Enable verbose debug logging",
-    )
-    parser.add_argument(
-        "--env",
-        type=str,
-        default=None,
-        help="Name of the WXO environment to activate before import",
-    )
-    parser.add_argument(
-        "--api-key",
-        type=str,
-        default=None,
-        help="API key for non-interactive environment activation (falls back to WXO_API_KEY env var)",
-    )
-    args = parser.parse_args()
+async def export_tools(
+    tool_names: list[str],
+    project_root: Path,
+    max_retries: int,
+    concurrency: int,
+) -> list[bool | BaseException]:
+    """Export and extract tools concurrently, running at most ``concurrency`` CLI calls at once.
 
-    logging.basicConfig(
-        level=logging.DEBUG if args.verbose else logging.INFO,
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    )
+    Each tool writes to its own ``tools/<name>.zip`` and ``tools/<name>/``, so no locking is needed.
+
+    Returns:
+        One result per tool, in input order: the import status, or the exception it raised.
+    """
+    sem = asyncio.Semaphore(concurrency)
+
+    async def _bounded(tool_name: str) -> bool:
+        async with sem:
+            return await export_and_extract_tool(tool_name, project_root, max_retries)
 
-    logger.info("=" * 60)
+    return await asyncio.gather(*(_bounded(name) for name in tool_names), return_exceptions=True)
+
+
+async def main(args: argparse.Namespace) -> int:
+    """Export every exportable tool into tools/ and return the process exit code."""
+    logger.info(SEPARATOR)
     logger.info("Starting tool import process from Watsonx Orchestrate")
     logger.info("Max retry attempts: %d", args.retries)
-    logger.info("=" * 60)
+    logger.info(SEPARATOR)
 
     # Activate target environment if specified
     if args.env:
         api_key = args.api_key or os.environ.get("WXO_API_KEY")
-        activate_environment(args.env, api_key)
+        await ensure_environment(args.env, api_key)
 
     project_root = Path(__file__).parent.parent.resolve()
     logger.info("Project root: %s", project_root)
+    # Created once here so each tool export can assume it exists.
+    (project_root / "tools").mkdir(exist_ok=True)
 
-    tools_list = run_orchestrate_tools_list()
+    tools_list = await run_orchestrate_tools_list()
     if not tools_list:
         logger.error("Failed to retrieve tools list. Exiting.")
-        sys.exit(1)
+        return 1
 
     # Handle if the output is a list or a dict with a 'tools' key
-    tools_to_process = (
-        tools_list if isinstance(tools_list, list) else tools_list.get("tools", [])
-    )
+    tools_to_process = tools_list if isinstance(tools_list, list) else tools_list.get("tools", [])
 
     # Filter out MCP tools (they cannot be exported, only imported from MCP server)
     exportable_tools = []
     mcp_tools = []
     for tool in tools_to_process:
-        binding = tool.get("binding", {})
-        if "mcp" in binding:
-            mcp_tools.append(tool.get("name", "unknown"))
+        # `binding` may be present but null in the listing
+        if "mcp" in (tool.get("binding") or {}):
+            mcp_tools.append(tool.get("name") or "unknown")
         else:
             exportable_tools.append(tool)
 
@@ -236,32 +320,68 @@ if __name__ == "__main__":
     if mcp_tools:
         logger.info("Skipping MCP tools: %s", ", ".join(mcp_tools))
 
-    success_count = 0
-    failed_tools = []
-
+    tool_names = []
     for idx, tool in enumerate(exportable_tools, 1):
         tool_name = tool.get("name")
         if not tool_name:
             logger.warning("Skipping tool at index %d (no name found)", idx)
             continue
+        # The name becomes tools/<name>/ and tools/<name>.zip, so it must be a single path component
+        if not isinstance(tool_name, str) or os.path.basename(tool_name) != tool_name or tool_name in (".", ".."):
+            logger.warning("Skipping tool at index %d (name %r is not a valid folder name)", idx, tool_name)
+            continue
 
         logger.info("Processing tool %d/%d: %s", idx, len(exportable_tools), tool_name)
-        try:
-            success = export_and_extract_tool(tool_name, project_root, args.retries)
-            if success:
-                success_count += 1
-            else:
-                failed_tools.append(tool_name)
-        except Exception as e:
-            logger.error("Failed to process tool %s: %s", tool_name, e, exc_info=True)
+        tool_names.append(tool_name)
+
+    results = await export_tools(tool_names, project_root, args.retries, args.concurrency)
+
+    success_count = 0
+    failed_tools = []
+    for tool_name, result in zip(tool_names, results, strict=True):
+        if isinstance(result, BaseException):
+            logger.error("Failed to process tool %s: %s", tool_name, result, exc_info=result)
+            failed_tools.append(tool_name)
+        elif result:
+            success_count += 1
+        else:
             failed_tools.append(tool_name)
 
-    logger.info("=" * 60)
+    logger.info(SEPARATOR)
     logger.info("Import process completed")
     logger.info("Successfully imported: %d/%d exportable tools", success_count, len(exportable_tools))
     if failed_tools:
         logger.warning("Failed tools (%d): %s", len(failed_tools), ", ".join(failed_tools))
-    logger.info("=" * 60)
+    logger.info(SEPARATOR)
 
-    if failed_tools:
-        sys.exit(1)
+    return 1 if failed_tools else 0
+
+
+if __name__ == "__main__":
+    parser = build_parser(
+        description="Import tools from Watsonx Orchestrate",
+    )
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=3,
+        help="Maximum number of retry attempts for timeouts (default: 3)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=positive_int,
+        default=8,
+        help="Maximum number of tools exported in parallel (default: 8)",
+    )
+    parser.add_argument(
+        "--deadline",
+        type=float,
+        default=1800,
+        help="Overall time budget in seconds for all orchestrate calls (default: 1800)",
+    )
+    args = parser.parse_args()
+
+    configure_logging(args.verbose)
+
+    set_deadline(args.deadline)
+    sys.exit(run_main(main(args)))
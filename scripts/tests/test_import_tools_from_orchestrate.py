@@ -0,0 +1,102 @@
+"""Tests for extracting tool archives in place in import_tools_from_orchestrate."""
+
+from __future__ import annotations
+
+import sys
+import zipfile
+from pathlib import Path
+
+import pytest
+
+# The scripts are run as files, so their shared helpers are imported as top-level modules.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from import_tools_from_orchestrate import _extract_tool  # noqa: E402
+
+
+def _zip(tmp_path: Path, members: dict[str, str]) -> Path:
+    """Write an archive holding ``members`` (name -> text; a trailing slash makes a folder)."""
+    zip_path = tmp_path / "tool.zip"
+    with zipfile.ZipFile(zip_path, "w") as zf:
+        for name, text in members.items():
+            zf.writestr(name, text)
+    return zip_path
+
+
+def _files(root: Path) -> dict[str, str]:
+    return {p.relative_to(root).as_posix(): p.read_text() for p in sorted(root.rglob("*")) if p.is_file()}
+
+
+@pytest.fixture
+def dirs(tmp_path: Path) -> tuple[Path, Path]:
+    """Return (tool folder, folder outside it that must never be written to)."""
+    outside = tmp_path / "outside"
+    outside.mkdir()
+    return tmp_path / "tools" / "my_tool", outside
+
+
+class TestExtractTool:
+    def test_fresh_extraction(self, tmp_path, dirs):
+        root, _ = dirs
+        root.parent.mkdir()
+        _extract_tool(_zip(tmp_path, {"my_tool.py": "v1", "lib/util.py": "u"}), root)
+        assert _files(root) == {"lib/util.py": "u", "my_tool.py": "v1"}
+
+    def test_overwrites_and_removes_stale_files(self, tmp_path, dirs):
+        root, _ = dirs
+        (root / "old_pkg").mkdir(parents=True)
+        (root / "old_pkg" / "gone.py").write_text("stale")
+        (root / "my_tool.py").write_text("v1")
+        _extract_tool(_zip(tmp_path, {"my_tool.py": "v2", "empty/": ""}), root)
+        assert _files(root) == {"my_tool.py": "v2"}
+        assert not (root / "old_pkg").exists()
+        assert (root / "empty").is_dir()
+
+    def test_file_becomes_folder(self, tmp_path, dirs):
+        root, _ = dirs
+        root.mkdir(parents=True)
+        (root / "helpers").write_text("was a file")
+        _extract_tool(_zip(tmp_path, {"helpers/__init__.py": "pkg"}), root)
+        assert _files(root) == {"helpers/__init__.py": "pkg"}
+
+    def test_folder_becomes_file(self, tmp_path, dirs):
+        root, _ = dirs
+        (root / "helpers").mkdir(parents=True)
+        (root / "helpers" / "__init__.py").write_text("pkg")
+        _extract_tool(_zip(tmp_path, {"helpers": "now a file"}), root)
+        assert _files(root) == {"helpers": "now a file"}
+
+    def test_does_not_write_through_folder_symlink(self, tmp_path, dirs):
+        root, outside = dirs
+        root.mkdir(parents=True)
+        (root / "lib").symlink_to(outside, target_is_directory=True)
+        _extract_tool(_zip(tmp_path, {"lib/sub/evil.py": "x", "my_tool.py": "v"}), root)
+        assert list(outside.iterdir()) == []
+        assert not (root / "lib").is_symlink()
+        assert _files(root) == {"lib/sub/evil.py": "x", "my_tool.py": "v"}
+
+    def test_does_not_write_through_file_symlink(self, tmp_path, dirs):
+        root, outside = dirs
+        root.mkdir(parents=True)
+        (outside / "secret.txt").write_text("keep")
+        (root / "my_tool.py").symlink_to(outside / "secret.txt")
+        _extract_tool(_zip(tmp_path, {"my_tool.py": "v"}), root)
+        assert (outside / "secret.txt").read_text() == "keep"
+        assert not (root / "my_tool.py").is_symlink()
+        assert _files(root) == {"my_tool.py": "v"}
+
+    def test_does_not_write_through_root_symlink(self, tmp_path, dirs):
+        root, outside = dirs
+        root.parent.mkdir()
+        root.symlink_to(outside, target_is_directory=True)
+        _extract_tool(_zip(tmp_path, {"my_tool.py": "v"}), root)
+        assert list(outside.iterdir()) == []
+        assert not root.is_symlink()
+        assert _files(root) == {"my_tool.py": "v"}
+
+    def test_rejects_members_outside_the_folder(self, tmp_path, dirs):
+        root, outside = dirs
+        root.parent.mkdir()
+        with pytest.raises(zipfile.BadZipFile):
+            _extract_tool(_zip(tmp_path, {"../../outside/evil.py": "x"}), root)
+        assert list(outside.iterdir()) == []
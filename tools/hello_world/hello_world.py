@@ -19,6 +19,7 @@ def hello_world(name: str) -> str:
     Returns:
         str: A greeting message.
     """
-    if not name or not name.strip():
+    stripped = name.strip() if name else ""
+    if not stripped:
         return "Hello, World!"
-    return f"Hello, {name.strip()}! Welcome to watsonx Orchestrate."
+    return f"Hello, {stripped}! Welcome to watsonx Orchestrate."